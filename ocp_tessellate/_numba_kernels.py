@@ -0,0 +1,48 @@
+"""Numeric kernels, compiled with numba if it is installed"""
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+
+except ImportError:
+
+    HAS_NUMBA = False
+
+
+def _bbox_loop(p, m):
+    # transform each point by the 3x4 matrix m and track min/max in one pass,
+    # min/max start with the first point (fastmath assumes there are no infs)
+    bb = np.empty(6)
+    for j in range(3):
+        c = m[j, 0] * p[0, 0] + m[j, 1] * p[0, 1] + m[j, 2] * p[0, 2] + m[j, 3]
+        bb[j] = c
+        bb[j + 3] = c
+
+    for i in range(1, p.shape[0]):
+        for j in range(3):
+            c = m[j, 0] * p[i, 0] + m[j, 1] * p[i, 1] + m[j, 2] * p[i, 2] + m[j, 3]
+            if c < bb[j]:
+                bb[j] = c
+            elif c > bb[j + 3]:
+                bb[j + 3] = c
+    return bb
+
+
+def _bbox_numpy(p, m):
+    # transposed (3, n) result, so that min/max run over contiguous rows
+    v = m[:, :3] @ p.T
+    v += m[:, 3:]
+    return np.concatenate((v.min(axis=1), v.max(axis=1)))
+
+
+# bbox_from_vertices(p, m) returns (xmin, ymin, zmin, xmax, ymax, zmax) of the
+# non empty (n, 3) points p transformed by the 3x4 affine matrix m.
+# Not parallel, since numba's default threading layer must not be entered from
+# several Python threads at once (see tessellate_group's parallel mode)
+if HAS_NUMBA:
+    bbox_from_vertices = njit(cache=True, fastmath=True)(_bbox_loop)
+else:
+    bbox_from_vertices = _bbox_numpy
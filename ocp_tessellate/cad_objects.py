@@ -214,16 +214,15 @@ class OcpGroup:
         return result
 
     def count_shapes(self):
-        def c(pg):
-            count = 0
-            for p in pg.objects:
+        count = 0
+        stack = [self]
+        while stack:
+            for p in stack.pop().objects:
                 if isinstance(p, OcpGroup):
-                    count += c(p)
+                    stack.append(p)
                 else:
                     count += 1
-            return count
-
-        return c(self)
+        return count
 
     def collect(
         self, path, instances, loc=None, discretize_edges=None, convert_vertices=None
@@ -1,5 +1,6 @@
 import enum
-from hashlib import sha256
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Iterable, List, Tuple, Union
 
 from ocp_tessellate.cad_objects import (
@@ -19,6 +20,17 @@ from ocp_tessellate.tessellator import (
 )
 from ocp_tessellate.utils import *
 
+try:
+    # cache ids only need to be unique, not cryptographically secure
+    from xxhash import xxh3_128 as hasher
+except ImportError:
+    import hashlib
+
+    def hasher():
+        # usedforsecurity=False lets OpenSSL pick its fastest (e.g. SHA-NI) backend
+        return hashlib.new("sha256", usedforsecurity=False)
+
+
 LINE_WIDTH = 2
 POINT_SIZE = 6
 
@@ -27,6 +39,73 @@ THICK_EDGE_COLOR = "MediumOrchid"
 VERTEX_COLOR = "MediumOrchid"
 FACE_COLOR = "Violet"
 
+# types of TopoDS classes
+TOPODS_TYPES = {
+    "TopoDS_Edge": "Edge",
+    "TopoDS_Face": "Face",
+    "TopoDS_Shell": "Shell",
+    "TopoDS_Solid": "Solid",
+    "TopoDS_Vertex": "Vertex",
+    "TopoDS_Wire": "Wire",
+}
+
+# kinds of types, used for selecting the right tessellation algorithm
+KINDS = {
+    "Edge": "edge",
+    "Face": "face",
+    "Shell": "face",
+    "Solid": "solid",
+    "Vertex": "vertex",
+    "Wire": "edge",
+}
+
+# default colors of ocp types and kinds of objects, solids use the converter's
+# default color
+DEFAULT_COLORS = {
+    # ocp types
+    "TopoDS_Edge": THICK_EDGE_COLOR,
+    "TopoDS_Face": FACE_COLOR,
+    "TopoDS_Shell": FACE_COLOR,
+    "TopoDS_Vertex": VERTEX_COLOR,
+    "TopoDS_Wire": THICK_EDGE_COLOR,
+    # kind of objects
+    "edge": THICK_EDGE_COLOR,
+    "wire": THICK_EDGE_COLOR,
+    "face": FACE_COLOR,
+    "shell": FACE_COLOR,
+    "vertex": VERTEX_COLOR,
+}
+
+# maximum number of instances tessellated at once in parallel mode
+PARALLEL_INSTANCES = 4
+
+# to_ocp options passed to each handler besides the object and its name
+HANDLER_ARGS = {
+    "handle_list_tuple": ("rgba_color", "sketch_local", "helper_scale", "level"),
+    "handle_compound": ("rgba_color", "sketch_local", "helper_scale", "level"),
+    "handle_dict": ("rgba_color", "sketch_local", "helper_scale", "level"),
+    "handle_build123d_assembly": (
+        "rgba_color",
+        "render_joints",
+        "helper_scale",
+        "level",
+    ),
+    "handle_cadquery_assembly": ("rgba_color", "render_mates", "helper_scale", "level"),
+    "handle_ocp_wrapper": (),
+    "handle_shape_list": ("rgba_color", "show_parent", "level"),
+    "handle_location_list": ("helper_scale", "level"),
+    "handle_build123d_builder": (
+        "rgba_color",
+        "sketch_local",
+        "render_joints",
+        "level",
+    ),
+    "handle_shapes": ("render_joints", "rgba_color", "level"),
+    "handle_cadquery_sketch": ("rgba_color", "level"),
+    "handle_locations_planes": ("rgba_color", "helper_scale", "sketch_local", "level"),
+    "handle_axis": ("rgba_color", "helper_scale", "level"),
+}
+
 DEBUG = False
 
 # Alias for every object containing a "wrapped" attribute of type TopoDS_Shape
@@ -59,6 +138,21 @@ class Progress:
         print(mark, end="", flush=True)
 
 
+class LockedProgress:
+    def __init__(self, progress: Progress):
+        """
+        Serialize the progress updates of tessellation threads.
+
+        @param progress: The progress bar to forward the updates to
+        """
+        self.progress = progress
+        self.lock = threading.Lock()
+
+    def update(self, mark):
+        with self.lock:
+            self.progress.update(mark)
+
+
 def _debug(level, msg, name=None, prefix="debug:", end="\n"):
     if DEBUG:
         prefix = "  " * level + prefix
@@ -95,15 +189,7 @@ def get_type(obj: TopoDS_Shape) -> str:
 
     @return: The type of the object
     """
-    kinds = {
-        "TopoDS_Edge": "Edge",
-        "TopoDS_Face": "Face",
-        "TopoDS_Shell": "Shell",
-        "TopoDS_Solid": "Solid",
-        "TopoDS_Vertex": "Vertex",
-        "TopoDS_Wire": "Wire",
-    }
-    typ = kinds.get(class_name(obj))
+    typ = TOPODS_TYPES.get(type(obj).__name__)
     if typ is None:
         raise ValueError(f"Unknown type: {type(obj)}")
     return typ
@@ -119,15 +205,7 @@ def get_kind(typ: str) -> str:
 
     @return: The kind of the object
     """
-    kinds = {
-        "Edge": "edge",
-        "Face": "face",
-        "Shell": "face",
-        "Solid": "solid",
-        "Vertex": "vertex",
-        "Wire": "edge",
-    }
-    kind = kinds.get(typ)
+    kind = KINDS.get(typ)
     if kind is None:
         raise ValueError(f"Unknown type: {typ}")
     return kind
@@ -150,21 +228,154 @@ def unwrap(
     return obj
 
 
+def is_empty(obj: Iterable) -> bool:
+    """
+    Check whether an iterable is empty without materializing it.
+
+    @param obj: The iterable
+
+    @return: True if the iterable has no elements
+    """
+    for _ in obj:
+        return False
+    return True
+
+
+# handler names of object types whose handler only depends on their type,
+# keyed by the type of the object and of its wrapped attribute
+_DISPATCH: Dict[Tuple[type, type], str] = {}
+
+
+def find_handler(
+    cad_obj: Any, unroll_compounds: bool, compound_type=get_compound_type
+) -> Union[str, None]:
+    """
+    Find the name of the OcpConverter method to handle a non empty object.
+
+    @param cad_obj: The object
+    @param unroll_compounds: The flag to unroll compounds
+    @param compound_type: The function to get the type of a TopoDS_Compound
+
+    @return: The name of the handler or None for unknown objects
+    """
+    key = (type(cad_obj), type(getattr(cad_obj, "wrapped", None)))
+
+    # objects with children might be build123d assemblies
+    if not getattr(cad_obj, "children", None):
+        handler = _DISPATCH.get(key)
+        if handler is not None:
+            return handler
+
+    # Generic iterables (tuple, list, but not ShapeList)
+    if isinstance(cad_obj, (list, tuple)) and not is_build123d_shapelist(cad_obj):
+        return "handle_list_tuple"
+
+    # Compounds / topods_compounds
+    topods_obj = cad_obj.wrapped if is_wrapped(cad_obj) else cad_obj
+    compound = is_topods_compound(topods_obj)
+    if compound and (unroll_compounds or compound_type(topods_obj) == "mixed"):
+        return "handle_compound"
+
+    # Dicts
+    if isinstance(cad_obj, dict):
+        return "handle_dict"
+
+    if is_build123d_assembly(cad_obj):
+        handler = "handle_build123d_assembly"
+
+    elif is_cadquery_assembly(cad_obj):
+        handler = "handle_cadquery_assembly"
+
+    # OcpWrapper (ImageFace, CoordSystem, CoordAxis, etc.)
+    elif isinstance(cad_obj, OcpWrapper):
+        handler = "handle_ocp_wrapper"
+
+    # build123d ShapeList
+    elif is_build123d_shapelist(cad_obj) or (
+        is_cadquery(cad_obj) and not is_cadquery_empty_workplane(cad_obj)
+    ):
+        handler = "handle_shape_list"
+
+    # build123d LocationLists
+    elif is_build123d_locationlist(cad_obj):
+        handler = "handle_location_list"
+
+    # build123d BuildPart, BuildSketch, BuildLine
+    elif is_build123d(cad_obj):
+        handler = "handle_build123d_builder"
+
+    # TopoDS_Shape, TopoDS_Compound, TopoDS_Edge, TopoDS_Face, TopoDS_Shell,
+    # TopoDS_Solid, TopoDS_Vertex, TopoDS_Wire,
+    # build123d Shape, Compound, Edge, Face, Shell, Solid, Vertex
+    # CadQuery shapes Solid, Shell, Face, Wire, Edge, Vertex
+    elif (
+        is_topods_shape(cad_obj)
+        or is_build123d_shape(cad_obj)
+        or is_cadquery_shape(cad_obj)
+    ):
+        handler = "handle_shapes"
+
+    # Cadquery sketches
+    elif is_cadquery_sketch(cad_obj):
+        handler = "handle_cadquery_sketch"
+
+    # build123d Location/Plane or TopLoc_Location or gp_Pln
+    elif (
+        is_build123d_location(cad_obj)
+        or is_toploc_location(cad_obj)
+        or is_build123d_plane(cad_obj)
+        or is_gp_plane(cad_obj)
+        or is_cadquery_empty_workplane(cad_obj)
+    ):
+        handler = "handle_locations_planes"
+
+    # build123d Axis or gp_Ax1
+    elif is_build123d_axis(cad_obj) or is_gp_axis(cad_obj):
+        handler = "handle_axis"
+
+    else:
+        return None
+
+    # Iterables and CadQuery workplanes are handled depending on their content,
+    # compounds depending on whether they are mixed and build123d assemblies
+    # depending on their children, e.g. a Solid with children is an assembly
+    if not (
+        isinstance(cad_obj, Iterable)
+        or compound
+        or is_cadquery(cad_obj)
+        or handler == "handle_build123d_assembly"
+    ):
+        _DISPATCH[key] = handler
+
+    return handler
+
+
 def create_cache_id(obj: TopoDS_Shape) -> str:
     """
     The TopoDS_Shape objects are serialized and hashed to create a unique id.
-    The current approach is to use the sha256 hash of the serialized object.
+    The current approach is to use the xxh3_128 hash of the serialized object
+    (or sha256 if xxhash is not installed).
 
     @param obj: The object of type TopoDS_Shape or a subclass
 
     @return: The unique id of the object
     """
-    sha = sha256()
     objs = [obj] if not isinstance(obj, (tuple, list)) else obj
-    for o in objs:
-        sha.update(serialize(o.wrapped if is_wrapped(o) else o))
+    shapes = [o.wrapped if is_wrapped(o) else o for o in objs]
+
+    try:
+        # stream the BRep data directly into the hasher without a bytes copy
+        h = hasher()
+        stream = HashWriter(h)
+        for shape in shapes:
+            serialize_to(shape, stream)
 
-    return sha.hexdigest()
+    except Exception:  # pylint: disable=broad-except
+        h = hasher()
+        for shape in shapes:
+            h.update(serialize(shape))
+
+    return h.hexdigest()
 
 
 class OcpConverter:
@@ -175,6 +386,17 @@ class OcpConverter:
         @param progress: The progress class to provide updates during the conversion
         """
         self.instances: List[TopoDS_Shape] = []
+        # shape hash -> indices into self.instances with this hash
+        self._instance_index: Dict[int, List[int]] = {}
+        # (instance ref, objects to hash, OcpObject to patch) collected during the
+        # walk and hashed once in _flush_hashes
+        self._pending_hashes: List[Tuple[int, Any, Union[OcpObject, None]]] = []
+        # nesting depth of to_ocp calls
+        self._depth = 0
+        # id of a wire -> (wire, edges of the wire), reset after each conversion
+        self._wire_edges_memo: Dict[int, Tuple[TopoDS_Shape, List[TopoDS_Edge]]] = {}
+        # id of a compound -> (compound, type of the compound)
+        self._compound_type_memo: Dict[int, Tuple[TopoDS_Shape, str]] = {}
         self.ocp = None
         self.progress = progress
         self.default_color = get_default("default_color")
@@ -186,11 +408,12 @@ class OcpConverter:
     ) -> Tuple[int, TopLoc_Location]:
         """
         Identify if the object is already available in the instances list based on
-        comparing their TShapes.
+        comparing their TShapes. Candidates are looked up by the hash of the
+        relocated shape, so only instances with the same hash get compared.
         If not, create a new instance and add it to the list.
 
         @param obj: The object of type TopoDS_Shape or a subclass
-        @param cache_id: The unique id of the object
+        @param cache_id: The unique id of the object or None if it is computed later
         @param name: The name of the object
 
         @return: The reference to the object in the instances list and the location
@@ -199,11 +422,17 @@ class OcpConverter:
 
         # Create the relocated object as a copy
         loc = obj.Location()  # Get location
-        obj2 = downcast(obj.Moved(loc.Inverted()))
+        if loc.IsIdentity():
+            # already at the origin, no need to relocate
+            obj2 = downcast(obj)
+        else:
+            obj2 = downcast(obj.Moved(loc.Inverted()))
 
         # check if the same instance is already available
-        for i, instance in enumerate(self.instances):
-            if instance["obj"].TShape() == obj2.TShape():
+        # (the hash of a shape does not depend on its orientation)
+        candidates = self._instance_index.setdefault(obj2.HashCode(MAX_HASH_KEY), [])
+        for i in candidates:
+            if self.instances[i]["obj"].TShape() == obj2.TShape():
                 ref = i
 
                 if self.progress is not None:
@@ -215,9 +444,57 @@ class OcpConverter:
             # append the new instance
             ref = len(self.instances)
             self.instances.append({"obj": obj2, "cache_id": cache_id, "name": name})
+            candidates.append(ref)
 
         return ref, loc
 
+    def get_wire_edges(self, wire: TopoDS_Shape) -> List[TopoDS_Edge]:
+        """
+        Get the edges of a wire (or a compound of wires). The result is memoized
+        per wire during one conversion, so shared wires are only decomposed once.
+
+        @param wire: The TopoDS_Wire or TopoDS_Compound
+
+        @return: The list of edges
+        """
+        entry = self._wire_edges_memo.get(id(wire))
+        if entry is None:
+            # keep the wire alive, else its id could be reused by other objects
+            entry = (wire, list(get_edges(wire)))
+            self._wire_edges_memo[id(wire)] = entry
+        return list(entry[1])
+
+    def get_compound_type(self, compound: TopoDS_Compound) -> str:
+        """
+        Get the type of a compound. The result is memoized per compound, so that
+        dispatching and handling a compound only walks it once.
+
+        @param compound: The TopoDS_Compound
+
+        @return: The type name of the compound's shapes or "mixed"
+        """
+        entry = self._compound_type_memo.get(id(compound))
+        if entry is None:
+            # keep the compound alive, else its id could be reused by other objects
+            entry = (compound, get_compound_type(compound))
+            self._compound_type_memo[id(compound)] = entry
+        return entry[1]
+
+    def _flush_hashes(self):
+        """
+        Compute the cache ids of all instances collected since the last flush.
+        Only the first occurrence of every instance gets hashed, all other objects
+        referencing the same instance share its cache id.
+        """
+        for ref, objs, ocp_obj in self._pending_hashes:
+            instance = self.instances[ref]
+            if instance["cache_id"] is None:
+                instance["cache_id"] = create_cache_id(objs)
+            if ocp_obj is not None:
+                ocp_obj.cache_id = instance["cache_id"]
+
+        self._pending_hashes = []
+
     def unify(
         self,
         objs: Union[TopoDS_Shape, List[TopoDS_Shape]],
@@ -243,11 +520,12 @@ class OcpConverter:
             ocp_obj = objs[0]
             # unroll TopoDS_Compound
             if is_topods_compound(ocp_obj):
-                ocp_objs = list(list_topods_compound(ocp_obj))
-                if len(ocp_objs) == 1:
-                    ocp_obj = downcast(ocp_objs[0])
+                # fast path for the common compound with only one child
+                child = get_single_child(ocp_obj)
+                if child is not None:
+                    ocp_obj = child
                 elif kind in ["edge", "vertex"]:
-                    ocp_obj = ocp_objs
+                    ocp_obj = list(list_topods_compound(ocp_obj))
 
         # else make a TopoDS_Compound
         elif kind in ["solid", "face", "shell"]:
@@ -266,16 +544,16 @@ class OcpConverter:
             color.a = alpha
 
         if kind in ("solid", "face", "shell"):
-            cache_id = create_cache_id(objs)
-            ref, loc = self.get_instance(ocp_obj, cache_id, name)
-            return OcpObject(
+            ref, loc = self.get_instance(ocp_obj, None, name)
+            result = OcpObject(
                 kind,
                 ref=ref,
                 name=name,
                 loc=loc,
                 color=color,
-                cache_id=cache_id,
             )
+            self._pending_hashes.append((ref, objs, result))
+            return result
         else:
             return OcpObject(
                 kind,
@@ -302,46 +580,41 @@ class OcpConverter:
 
         @return: The color of the object
         """
-        default_colors = {
-            # ocp types
-            "TopoDS_Edge": THICK_EDGE_COLOR,
-            "TopoDS_Face": FACE_COLOR,
-            "TopoDS_Shell": FACE_COLOR,
-            "TopoDS_Solid": self.default_color,
-            "TopoDS_Vertex": VERTEX_COLOR,
-            "TopoDS_Wire": THICK_EDGE_COLOR,
-            # kind of objects
-            "edge": THICK_EDGE_COLOR,
-            "wire": THICK_EDGE_COLOR,
-            "face": FACE_COLOR,
-            "shell": FACE_COLOR,
-            "solid": self.default_color,
-            "vertex": VERTEX_COLOR,
-        }
-
         if color is not None:
             if isinstance(color, tuple):
                 # return triple color array for CoordSystems
                 return color
             else:
-                col_a = Color(color)
+                col_a = cached_color(color)
 
         elif hasattr(obj, "color") and obj.color is not None:
-            col_a = Color(obj.color)
+            col_a = cached_color(obj.color)
 
         # elif color is None and is_topods_compound(obj) and kind is not None:
         elif color is None and kind is not None:
-            col_a = Color(default_colors[kind])
+            col_a = self._default_color(kind)
 
         # else return default color
         else:
-            col_a = Color(default_colors.get(class_name(unwrap(obj))))
+            col_a = self._default_color(class_name(unwrap(obj)))
 
         if alpha is not None:
             col_a.a = alpha
 
         return col_a
 
+    def _default_color(self, key: str) -> Color:
+        """
+        Get the default color for an ocp type or a kind of object.
+
+        @param key: The ocp type or the kind of the object
+
+        @return: The default color
+        """
+        if key in ("TopoDS_Solid", "solid"):
+            return cached_color(self.default_color)
+        return cached_color(DEFAULT_COLORS.get(key))
+
     # ============================= Iterate Containers ============================== #
 
     def _unroll_iterable(
@@ -371,20 +644,76 @@ class OcpConverter:
         @return: The OcpGroup hierarchy
         """
         ocp_obj: OcpGroup = OcpGroup(name=obj_name)
-        for name, obj in objs:
 
-            result = self.to_ocp(
-                obj,
-                names=[name],
-                colors=[rgba_color],
-                sketch_local=sketch_local,
-                helper_scale=helper_scale,
-                level=level + 1,
-            )
-            if result.length > 0:
-                ocp_obj.add(result.cleanup())
+        # Nested lists, tuples and dicts are unrolled with an explicit work stack
+        # instead of recursing via to_ocp for every level.
+        # Entries are (iterator of (name, obj), group, level, parent group)
+        stack = [(iter(objs), ocp_obj, level, None)]
+        while stack:
+            items, group, lvl, parent = stack[-1]
+            for name, obj in items:
+                nested = self._plain_container(obj, name, lvl + 1)
+                if nested is not None:
+                    sub_items, sub_name = nested
+                    stack.append(
+                        (iter(sub_items), OcpGroup(name=sub_name), lvl + 1, group)
+                    )
+                    break
+
+                result = self.to_ocp(
+                    obj,
+                    names=[name],
+                    colors=[rgba_color],
+                    sketch_local=sketch_local,
+                    helper_scale=helper_scale,
+                    level=lvl + 1,
+                )
+                if result.length > 0:
+                    group.add(result.cleanup())
+            else:
+                stack.pop()
+                group.make_unique_names()
+                if parent is not None and group.length > 0:
+                    parent.add(group.cleanup())
 
-        return ocp_obj.make_unique_names()
+        return ocp_obj
+
+    def _plain_container(
+        self, obj: Any, obj_name: Union[str, None], level: int
+    ) -> Union[Tuple[Iterable, str], None]:
+        """
+        Check whether obj is a non empty built-in list, tuple or dict that can be
+        unrolled without going through to_ocp.
+
+        @param obj: The object to check
+        @param obj_name: The name of the object
+        @param level: The level of the hierarchy
+
+        @return: The (name, obj) pairs and the group name, or None
+        """
+        typ = type(obj)
+        if (typ is dict or typ is list or typ is tuple) and len(obj) > 0:
+            return self._container_items(obj, obj_name, level)
+        return None
+
+    def _container_items(
+        self, obj: Union[List, Tuple, Dict], obj_name: Union[str, None], level: int
+    ) -> Tuple[Iterable, str]:
+        """
+        Get the (name, obj) pairs and the group name of a list, tuple or dict.
+
+        @param obj: The list, tuple or dict
+        @param obj_name: The name of the object
+        @param level: The level of the hierarchy
+
+        @return: The (name, obj) pairs and the group name
+        """
+        if isinstance(obj, dict):
+            _debug(level, "handle_dict", obj_name)
+            return obj.items(), get_name(obj, obj_name, "Dict")
+
+        _debug(level, "handle_list_tuple", obj_name)
+        return zip([None] * len(obj), obj), get_name(obj, obj_name, "List")
 
     def handle_list_tuple(
         self,
@@ -407,10 +736,10 @@ class OcpConverter:
 
         @return: The OcpGroup hierarchy
         """
-        _debug(level, "handle_list_tuple", obj_name)
+        items, name = self._container_items(cad_obj, obj_name, level)
         return self._unroll_iterable(
-            zip([None] * len(cad_obj), cad_obj),
-            get_name(cad_obj, obj_name, "List"),
+            items,
+            name,
             rgba_color,
             sketch_local,
             helper_scale,
@@ -437,11 +766,10 @@ class OcpConverter:
 
         @return: The OcpGroup hierarchy
         """
-        _debug(level, "handle_dict", obj_name)
-
+        items, name = self._container_items(cad_obj, obj_name, level)
         return self._unroll_iterable(
-            cad_obj.items(),
-            get_name(cad_obj, obj_name, "Dict"),
+            items,
+            name,
             rgba_color,
             sketch_local,
             helper_scale,
@@ -722,13 +1050,13 @@ class OcpConverter:
             cad_obj = cad_obj.vals()  # type: ignore [union-attr]
             if len(cad_obj) > 0:
                 if is_compound(cad_obj[0]):
-                    cad_obj = flatten([list(obj) for obj in cad_obj])
+                    cad_obj = flatten(cad_obj)
                 elif is_cadquery_sketch(cad_obj[0]):
                     return self.to_ocp(cad_obj).cleanup()
 
         # convert wires to edges
         if len(cad_obj) > 0 and is_wire(cad_obj[0]):
-            objs = [e.wrapped for o in cad_obj for e in o.edges()]
+            objs = [e for o in cad_obj for e in self.get_wire_edges(o.wrapped)]
             typ = "Wire"
 
         # unwrap everything else
@@ -783,11 +1111,14 @@ class OcpConverter:
 
         edges = None
         if is_topods_wire(obj):
-            typ, edges = "Wire", list(get_edges(obj))
+            typ, edges = "Wire", self.get_wire_edges(obj)
         elif is_topods_compound(obj):
-            typ = get_compound_type(obj)
+            # prefer the compound find_handler has already typed over its downcast
+            typ = self.get_compound_type(
+                cad_obj if is_topods_compound(cad_obj) else obj
+            )
             if typ == "Wire":
-                obj = list(get_edges(obj))
+                obj = self.get_wire_edges(obj)
         else:
             typ = type_name(obj)
 
@@ -1054,9 +1385,8 @@ class OcpConverter:
         ocp_obj = cad_obj.to_ocp()
         ocp_obj.name = name
         if ocp_obj.kind in ["solid", "imageface", "face", "shell"]:
-            ref, loc = self.get_instance(
-                cad_obj.objs[0], create_cache_id(cad_obj.objs[0]), name
-            )
+            ref, loc = self.get_instance(cad_obj.objs[0], None, name)
+            self._pending_hashes.append((ref, cad_obj.objs[0], None))
             ocp_obj.loc = cad_obj.loc * loc
             ocp_obj.ref = ref
             ocp_obj.obj = None
@@ -1087,6 +1417,47 @@ class OcpConverter:
 
     # ======================== Iterate and identify objects ========================= #
 
+    def _prepare_batch(
+        self,
+        cad_objs: Tuple[Any, ...],
+        names: Union[List[Union[str, None]], None],
+        colors: Union[List[Union[ColorLike, None]], None],
+        alphas: Union[List[Union[float, None]], None],
+    ) -> Tuple[List[Union[str, None]], List[Union[Color, None]]]:
+        """
+        Validate and normalize the names, colors and alphas given to to_ocp.
+
+        @param cad_objs: The list of objects
+        @param names: The list of names for the objects
+        @param colors: The list of colors for the objects
+        @param alphas: The list of alpha values for the objects
+
+        @return: The unique names and the rgba colors (Color or None) of the objects
+        """
+        if names is None:
+            names = [None] * len(cad_objs)
+        else:
+            if len(names) != len(cad_objs):
+                raise ValueError("Length of names does not match the number of objects")
+            names = make_unique(names)
+
+        if alphas is None:
+            alphas = [None] * len(cad_objs)
+
+        if len(alphas) != len(cad_objs):
+            raise ValueError("Length of alphas does not match the number of objects")
+
+        if colors is None:
+            colors = [None] * len(cad_objs)
+        else:
+            if len(colors) != len(cad_objs):
+                raise ValueError(
+                    "Length of colors does not match the number of objects"
+                )
+            colors = [get_rgba(c, a) for c, a in zip(colors, alphas)]
+
+        return names, colors
+
     def to_ocp(
         self,
         *cad_objs: Union[
@@ -1124,217 +1495,117 @@ class OcpConverter:
 
         @return: The OcpObject or OcpGroup hierarchy
         """
-        if loc is None:
-            loc = identity_location()
-        group = OcpGroup(loc=loc)
+        # cache ids are computed once the outermost call returns, handlers call
+        # to_ocp recursively and level is not necessarily the nesting depth
+        self._depth += 1
+        try:
+            if loc is None:
+                loc = identity_location()
+            group = OcpGroup(loc=loc)
 
-        # ============================= Validate parameters ============================= #
+            names, colors = self._prepare_batch(cad_objs, names, colors, alphas)
 
-        if names is None:
-            names = [None] * len(cad_objs)
-        else:
-            if len(names) != len(cad_objs):
-                raise ValueError("Length of names does not match the number of objects")
-            names = make_unique(names)
-
-        if alphas is None:
-            alphas = [None] * len(cad_objs)
+            if default_color is not None:
+                self.default_color = default_color
 
-        if len(alphas) != len(cad_objs):
-            raise ValueError("Length of alphas does not match the number of objects")
-
-        if colors is None:
-            colors = [None] * len(cad_objs)
-        else:
-            if len(colors) != len(cad_objs):
-                raise ValueError(
-                    "Length of colors does not match the number of objects"
-                )
-            colors = [get_rgba(c, a) for c, a in zip(colors, alphas)]
-
-        if default_color is not None:
-            self.default_color = default_color
-
-        # =========================== Loop over all objects ========================== #
+            # options the object handlers can take, see HANDLER_ARGS
+            options = dict(
+                sketch_local=sketch_local,
+                helper_scale=helper_scale,
+                render_mates=render_mates,
+                render_joints=render_joints,
+                show_parent=show_parent,
+                level=level,
+            )
 
-        for cad_obj, obj_name, rgba_color in zip(cad_objs, names, colors):  # type: ignore [arg-type]
+            # ======================== Loop over all objects ======================== #
 
-            # =================== Silently skip enums and known types =================== #
-            if (
-                isinstance(cad_obj, enum.Enum)
-                or is_ocp_color(cad_obj)
-                or isinstance(cad_obj, (int, float, bool, str, np.number, np.ndarray))
+            for cad_obj, obj_name, rgba_color in zip(
+                cad_objs, names, colors  # type: ignore [arg-type]
             ):
-                continue
-
-            # ============================== Prepare color ============================== #
 
-            # Get object color
-            if rgba_color is not None:
-                if not isinstance(rgba_color, Color):
-                    rgba_color = get_rgba(rgba_color)
-
-            elif hasattr(cad_obj, "color") and cad_obj.color is not None:
-                rgba_color = get_rgba(cad_obj.color)
+                # =============== Silently skip enums and known types =============== #
+                if (
+                    isinstance(cad_obj, enum.Enum)
+                    or is_ocp_color(cad_obj)
+                    or isinstance(
+                        cad_obj, (int, float, bool, str, np.number, np.ndarray)
+                    )
+                ):
+                    continue
+
+                # ========================== Prepare color ========================== #
+
+                # Get object color, given colors are already normalized by
+                # _prepare_batch
+                if rgba_color is None:
+                    obj_color = getattr(cad_obj, "color", None)
+                    if obj_color is not None:
+                        rgba_color = get_rgba(obj_color)
+
+                # ====================== Map Vector to Vertex ======================= #
+
+                if is_vector(cad_obj) or is_gp_vec(cad_obj):
+                    if isinstance(cad_obj, Iterable):
+                        target = list(cad_obj)
+                    elif hasattr(cad_obj, "toTuple"):
+                        target = cad_obj.toTuple()
+                    else:
+                        target = cad_obj.XYZ().Coord()  # type: ignore [union-attr]
+
+                    cad_obj = vertex(target)
+
+                # ===================== Empty list or compounds ===================== #
+
+                if (
+                    not is_cadquery_sketch(cad_obj)
+                    and not is_vertex(cad_obj)
+                    and (
+                        (is_wrapped(cad_obj) and cad_obj.wrapped is None)
+                        or (isinstance(cad_obj, Iterable) and is_empty(cad_obj))
+                    )
+                ):
+                    ocp_obj: Union[OcpGroup, OcpObject] = self.handle_empty_iterables(
+                        obj_name, level
+                    )
 
-            # =========================== Map Vector to Vertex ========================== #
+                # ======================== Dispatch by type ========================= #
 
-            if is_vector(cad_obj) or is_gp_vec(cad_obj):
-                if isinstance(cad_obj, Iterable):
-                    target = list(cad_obj)
-                elif hasattr(cad_obj, "toTuple"):
-                    target = cad_obj.toTuple()
                 else:
-                    target = cad_obj.XYZ().Coord()  # type: ignore [union-attr]
-
-                cad_obj = vertex(target)
-
-            # ========================= Empty list or compounds ========================= #
-
-            if (
-                not is_cadquery_sketch(cad_obj)
-                and not is_vertex(cad_obj)
-                and (
-                    (is_wrapped(cad_obj) and cad_obj.wrapped is None)
-                    or (isinstance(cad_obj, Iterable) and len(list(cad_obj)) == 0)
-                )
-            ):
-                ocp_obj: Union[OcpGroup, OcpObject] = self.handle_empty_iterables(
-                    obj_name, level
-                )
-
-            # ================================ Iterables ================================ #
-
-            # Generic iterables (tuple, list, but not ShapeList)
-            elif isinstance(cad_obj, (list, tuple)) and not is_build123d_shapelist(
-                cad_obj
-            ):
-                ocp_obj = self.handle_list_tuple(
-                    cad_obj, obj_name, rgba_color, sketch_local, helper_scale, level
-                )
-
-            # Compounds / topods_compounds
-            elif (
-                is_compound(cad_obj)
-                and (is_mixed_compound(cad_obj.wrapped) or unroll_compounds)
-            ) or (
-                is_topods_compound(cad_obj)
-                and (is_mixed_compound(cad_obj) or unroll_compounds)
-            ):
-                ocp_obj = self.handle_compound(
-                    cad_obj, obj_name, rgba_color, sketch_local, helper_scale, level
-                )
-
-            # Dicts
-            elif isinstance(cad_obj, dict):
-                ocp_obj = self.handle_dict(
-                    cad_obj, obj_name, rgba_color, sketch_local, helper_scale, level
-                )
-
-            # =============================== Assemblies ================================ #
-
-            elif is_build123d_assembly(cad_obj):
-                ocp_obj = self.handle_build123d_assembly(
-                    cad_obj,
-                    obj_name,
-                    rgba_color,
-                    render_joints,
-                    helper_scale,
-                    level,
-                )
-
-            elif is_cadquery_assembly(cad_obj):
-                ocp_obj = self.handle_cadquery_assembly(
-                    cad_obj,
-                    obj_name,
-                    rgba_color,
-                    render_mates,
-                    helper_scale,
-                    level,
-                )
-            # =============================== Conversions =============================== #
-
-            # OcpWrapper (ImageFace, CoordSystem, CoordAxis, etc.)
-            elif isinstance(cad_obj, OcpWrapper):
-                ocp_obj = self.handle_ocp_wrapper(cad_obj, obj_name)
-
-            # build123d ShapeList
-            elif is_build123d_shapelist(cad_obj) or (
-                is_cadquery(cad_obj) and not is_cadquery_empty_workplane(cad_obj)
-            ):
-                ocp_obj = self.handle_shape_list(
-                    cad_obj, obj_name, rgba_color, show_parent, level
-                )
-
-            # build123d LocationLists
-            elif is_build123d_locationlist(cad_obj):
-                ocp_obj = self.handle_location_list(
-                    cad_obj, obj_name, helper_scale, level
-                )
-
-            # build123d BuildPart, BuildSketch, BuildLine
-            elif is_build123d(cad_obj):
-                ocp_obj = self.handle_build123d_builder(
-                    cad_obj, obj_name, rgba_color, sketch_local, render_joints, level
-                )
-
-            # TopoDS_Shape, TopoDS_Compound, TopoDS_Edge, TopoDS_Face, TopoDS_Shell,
-            # TopoDS_Solid, TopoDS_Vertex, TopoDS_Wire,
-            # build123d Shape, Compound, Edge, Face, Shell, Solid, Vertex
-            # CadQuery shapes Solid, Shell, Face, Wire, Edge, Vertex
-            elif (
-                is_topods_shape(cad_obj)
-                or is_build123d_shape(cad_obj)
-                or is_cadquery_shape(cad_obj)
-            ):
-                ocp_obj = self.handle_shapes(
-                    cad_obj, obj_name, render_joints, rgba_color, level
-                )
-
-            # Cadquery sketches
-            elif is_cadquery_sketch(cad_obj):
-                ocp_obj = self.handle_cadquery_sketch(
-                    cad_obj, obj_name, rgba_color, level
-                )
-
-            # build123d Location/Plane or TopLoc_Location or gp_Pln
-            elif (
-                is_build123d_location(cad_obj)
-                or is_toploc_location(cad_obj)
-                or is_build123d_plane(cad_obj)
-                or is_gp_plane(cad_obj)
-                or is_cadquery_empty_workplane(cad_obj)
-            ):
-                ocp_obj = self.handle_locations_planes(
-                    cad_obj, obj_name, rgba_color, helper_scale, sketch_local, level
-                )
+                    options["rgba_color"] = rgba_color
+                    handler = find_handler(
+                        cad_obj, unroll_compounds, self.get_compound_type
+                    )
+                    if handler is None:
+                        print(
+                            "Unknown object"
+                            + ("" if obj_name is None else f" '{obj_name}'")
+                            + f" of type {type(cad_obj)}"
+                        )
+                        continue
 
-            # build123d Axis or gp_Ax1
-            elif is_build123d_axis(cad_obj) or is_gp_axis(cad_obj):
-                ocp_obj = self.handle_axis(
-                    cad_obj, obj_name, rgba_color, helper_scale, level
-                )
+                    args = {a: options[a] for a in HANDLER_ARGS[handler]}
+                    ocp_obj = getattr(self, handler)(cad_obj, obj_name, **args)
 
-            else:
-                print(
-                    "Unknown object"
-                    + ("" if obj_name is None else f" '{obj_name}'")
-                    + f" of type {type(cad_obj)}"
-                )
-                continue
+                if DEBUG:
+                    print(f"{'  '*level}=>", ocp_obj)
 
-            if DEBUG:
-                print(f"{'  '*level}=>", ocp_obj)
+                if not (isinstance(ocp_obj, OcpGroup) and ocp_obj.length == 0):
+                    group.add(ocp_obj)
 
-            if not (isinstance(ocp_obj, OcpGroup) and ocp_obj.length == 0):
-                group.add(ocp_obj)
+            group.make_unique_names()
 
-        group.make_unique_names()
+            if group.length == 1 and isinstance(group.objects[0], OcpGroup):
+                group = group.cleanup()
 
-        if group.length == 1 and isinstance(group.objects[0], OcpGroup):
-            group = group.cleanup()
+            return group
 
-        return group
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self._flush_hashes()
+                # wires can be moved in place between conversions (build123d)
+                self._wire_edges_memo = {}
 
 
 #
@@ -1392,6 +1663,26 @@ def to_ocpgroup(
     return ocp_group, converter.instances
 
 
+def shares_edges(objs: List[TopoDS_Shape]) -> bool:
+    """
+    Check whether at least two of the shapes share an edge (TShape), independent
+    of the edge locations. Shapes sharing a face also share its edges.
+
+    @param objs: The shapes
+
+    @return: True if an edge is shared between shapes, else False
+    """
+    seen = TopTools_IndexedMapOfShape()
+    no_loc = TopLoc_Location()
+    for obj in objs:
+        edges = [edge.Located(no_loc) for edge in get_edges(obj)]
+        if any(seen.Contains(edge) for edge in edges):
+            return True
+        for edge in edges:
+            seen.Add(edge)
+    return False
+
+
 def tessellate_group(
     group: OcpGroup,
     instances: List[TopoDS_Shape],
@@ -1411,44 +1702,65 @@ def tessellate_group(
     @return: The meshed instances, the shapes, the states, and the mapping
     """
 
-    def get_bb_max(shapes, meshed_instances, loc=None, bbox=None):
-        for shape in shapes["parts"]:
-            new_loc = loc if shape["loc"] is None else loc * tq_to_loc(*shape["loc"])
-            if shape.get("parts") is None:
+    def get_bb_max(shapes, meshed_instances, loc=None):
+        # collect all leaf bounding boxes with an explicit stack of
+        # (group, accumulated location) and reduce them in one go
+        bbs = []
+        stack = [(shapes, loc)]
+        while stack:
+            group, group_loc = stack.pop()
+            for shape in group["parts"]:
+                new_loc = (
+                    group_loc
+                    if shape["loc"] is None
+                    else group_loc * tq_to_loc(*shape["loc"])
+                )
+                if shape.get("parts") is not None:
+                    stack.append((shape, new_loc))
+                    continue
+
                 if shape["type"] == "shapes":
                     # Solids, shells and faces are instances and need to calculate
                     # the bounding box at the accumulated location
                     ind = shape["shape"]["ref"]
                     vertices = meshed_instances[ind]["vertices"]
-                    bb = np_bbox(vertices, *loc_to_tq(new_loc))
+                    bb = np_bbox_from_matrix(vertices, loc_to_matrix(new_loc))
                 else:
                     # wires, edges, vertices already have a bounding box
                     bb = shape["bb"].to_dict()
                     # delete the BoundingBox object, it can't be serialized
                     del shape["bb"]
 
-                if bbox is None:
-                    bbox = bb
-                else:
-                    bbox = {
-                        "xmin": min(bbox["xmin"], bb["xmin"]),
-                        "xmax": max(bbox["xmax"], bb["xmax"]),
-                        "ymin": min(bbox["ymin"], bb["ymin"]),
-                        "ymax": max(bbox["ymax"], bb["ymax"]),
-                        "zmin": min(bbox["zmin"], bb["zmin"]),
-                        "zmax": max(bbox["zmax"], bb["zmax"]),
-                    }
-            else:
-                bbox = get_bb_max(shape, meshed_instances, new_loc, bbox)
+                if bb is not None:
+                    bbs.append(
+                        (
+                            bb["xmin"],
+                            bb["ymin"],
+                            bb["zmin"],
+                            bb["xmax"],
+                            bb["ymax"],
+                            bb["zmax"],
+                        )
+                    )
+
+        bbs = np.asarray(bbs, dtype=np.float64)
+        bbmin = bbs[:, :3].min(axis=0)
+        bbmax = bbs[:, 3:].max(axis=0)
 
         # Increase bounding box dimensions that are too small
         # Will only be used to calculate the viewing box size of the group
-        for a in ["x", "y", "z"]:
-            if bbox[f"{a}max"] - bbox[f"{a}min"] < 1e-6:
-                bbox[f"{a}max"] += 0.1
-                bbox[f"{a}min"] -= 0.1
-
-        return bbox
+        small = bbmax - bbmin < 1e-6
+        bbmin[small] -= 0.1
+        bbmax[small] += 0.1
+
+        return {
+            "xmin": float(bbmin[0]),
+            "xmax": float(bbmax[0]),
+            "ymin": float(bbmin[1]),
+            "ymax": float(bbmax[1]),
+            "zmin": float(bbmin[2]),
+            "zmax": float(bbmax[2]),
+        }
 
     def _discretize_edges(obj, name, id_):
         with Timer(timeit, name, "bounding box:", 2) as t:
@@ -1475,40 +1787,59 @@ def tessellate_group(
     if kwargs is None:
         kwargs = {}
 
+    # instances without cache id would all share the tessellation cache entry
+    for i, instance in enumerate(instances):
+        if instance["cache_id"] is None:
+            raise ValueError(f"Instance {i} ('{instance['name']}') has no cache id")
+
     mapping, shapes = group.collect(
         "", instances, None, _discretize_edges, _convert_vertices
     )
 
     states = group.to_state()
 
-    meshed_instances = []
-
     deviation = preset("deviation", kwargs.get("deviation"))
     angular_tolerance = preset("angular_tolerance", kwargs.get("angular_tolerance"))
 
     render_edges = preset("render_edges", kwargs.get("render_edges"))
     render_normals = preset("render_normals", kwargs.get("render_normals"))
 
+    # Tessellating instances in threads only pays off if the OCP build releases
+    # the GIL during meshing (e.g. the native tessellator), hence opt-in.
+    # Instances sharing an edge would write the mesh data of the same TEdge (and
+    # TFace) concurrently and are tessellated serially
+    parallel = (
+        preset("parallel", kwargs.get("parallel"))
+        and not timeit
+        and len(instances) > 1
+        and not shares_edges([instance["obj"] for instance in instances])
+    )
+    if parallel and progress is not None:
+        progress = LockedProgress(progress)
+
     max_accuracy = 0.0
 
+    qualities = []
     for i, instance in enumerate(instances):
         with Timer(timeit, f"instance({i})", "compute quality:", 2) as t:
-            shape = instance["obj"]
             # A first rough estimate of the bounding box.
             # Will be too large, but is sufficient for computing the quality
             # location is not relevant here
-            bb = bounding_box(shape, loc=None, optimal=False)
+            bb = bounding_box(instance["obj"], loc=None, optimal=False)
             quality = compute_quality(bb, deviation=deviation)
+            qualities.append(quality)
             t.info = str(bb)
 
             if quality > max_accuracy:
                 max_accuracy = quality
 
+    def _tessellate(i):
+        instance, quality = instances[i], qualities[i]
         with Timer(
             timeit, f"instance({i}):{instance['name']}", "tessellate:     ", 2
         ) as t:
             mesh = tessellate(
-                shape,
+                instance["obj"],
                 instance["cache_id"],
                 deviation=deviation,
                 quality=quality,
@@ -1518,10 +1849,19 @@ def tessellate_group(
                 progress=None if timeit else progress,
                 shape_id="n/a",
             )
-            meshed_instances.append(mesh)
             t.info = (
                 f"{{quality:{quality:.4f}, angular_tolerance:{angular_tolerance:.2f}}}"
             )
+        return mesh
+
+    if parallel:
+        # BRepMesh already meshes the faces of each instance in its own threads,
+        # so only run a few instances at once to not oversubscribe the CPU
+        workers = min(PARALLEL_INSTANCES, len(instances))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            meshed_instances = list(executor.map(_tessellate, range(len(instances))))
+    else:
+        meshed_instances = [_tessellate(i) for i in range(len(instances))]
 
     shapes["normal_len"] = max_accuracy / deviation * 4 if render_normals else 0
     with Timer(timeit, "", "compute bounding box:", 2) as t:
@@ -54,6 +54,9 @@ class Defaults:
         - render_mates:       Render mates (for MAssemblies, default=False)
         - render_joints:      Render build12d joints (default=False)
         - helper_scale:         Scale of rendered mates (for MAssemblies, default=1)
+        - parallel:           Tessellate instances in threads, only faster if meshing releases the GIL,
+                              e.g. the native tessellator. Instances sharing edges are tessellated
+                              serially, since OCCT would write their mesh data concurrently (default=False)
 
         VIEWER OPTIONS
         - control:            Use trackball controls ('trackball') or orbit controls ('orbit') (default='trackball')
@@ -123,6 +126,7 @@ class Defaults:
             "render_mates": False,
             "render_joints": False,
             "helper_scale": 1,
+            "parallel": False,
             #
             # viewer options
             #
@@ -281,6 +285,7 @@ def tessellation_args(config):
             "render_mates",
             "render_joints",
             "helper_scale",
+            "parallel",
             "quality",
         ]
     }
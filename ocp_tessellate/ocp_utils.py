@@ -15,11 +15,10 @@
 #
 
 import io
-import itertools
 import os
-import sys
 import tempfile
 from collections.abc import Iterable
+from functools import lru_cache
 
 import numpy as np
 import OCP
@@ -90,9 +89,9 @@ from OCP.TopTools import (  # type: ignore
     TopTools_IndexedDataMapOfShapeListOfShape,
     TopTools_IndexedMapOfShape,
 )
-from quaternion import rotate_vectors
 
-from .utils import Color, class_name, distance, flatten, type_name
+from ._numba_kernels import bbox_from_vertices
+from .utils import Color, class_name, flatten, type_name
 
 MAX_HASH_KEY = 2147483647
 
@@ -129,9 +128,13 @@ downcast_LUT = {
 }
 
 
+# the shape types are 0 (compound) to 7 (vertex), and indexing a list is much
+# faster than hashing the TopAbs_ShapeEnum for a dict lookup
+_downcast_funcs = [downcast_LUT[t] for t in sorted(downcast_LUT, key=int)]
+
+
 def downcast(obj):
-    d_func = downcast_LUT[obj.ShapeType()]
-    return d_func(obj)
+    return _downcast_funcs[obj.ShapeType()](obj)
 
 
 def make_compound(objs):
@@ -180,7 +183,11 @@ def cross(v1, v2):
 
 
 def _has(obj, attrs):
-    return all([hasattr(obj, a) for a in attrs])
+    # plain loop, stops at the first missing attribute without a list or generator
+    for a in attrs:
+        if not hasattr(obj, a):
+            return False
+    return True
 
 
 #
@@ -189,19 +196,23 @@ def _has(obj, attrs):
 
 
 def is_cadquery(obj):
-    return _has(obj, ["objects", "ctx", "val"])
+    return _has(obj, ("objects", "ctx", "val"))
 
 
 def is_cadquery_shape(obj):
-    return _has(obj, ["wrapped", "forConstruction"]) and is_topods_shape(obj.wrapped)
+    return (
+        hasattr(obj, "wrapped")
+        and hasattr(obj, "forConstruction")
+        and is_topods_shape(obj.wrapped)
+    )
 
 
 def is_cadquery_assembly(obj):
-    return _has(obj, ["obj", "loc", "name", "children"])
+    return _has(obj, ("obj", "loc", "name", "children"))
 
 
 def is_cadquery_massembly(obj):
-    return _has(obj, ["obj", "loc", "name", "children", "mates"])
+    return _has(obj, ("obj", "loc", "name", "children", "mates"))
 
 
 def is_cadquery_sketch(obj):
@@ -224,7 +235,7 @@ def is_vector(obj):
 
 
 def is_massembly(obj):
-    return _has(obj, ["obj", "loc", "name", "children", "mates"])
+    return _has(obj, ("obj", "loc", "name", "children", "mates"))
 
 
 def is_wrapped(obj):
@@ -232,7 +243,7 @@ def is_wrapped(obj):
 
 
 def is_build123d(obj):
-    return _has(obj, ["_obj", "_obj_name", "_tag"]) and not isinstance(obj, type)
+    return _has(obj, ("_obj", "_obj_name", "_tag")) and not isinstance(obj, type)
 
 
 def is_build123d_part(obj):
@@ -248,7 +259,11 @@ def is_build123d_line(obj):
 
 
 def is_build123d_shape(obj):
-    return _has(obj, ["wrapped", "children"]) and is_topods_shape(obj.wrapped)
+    return (
+        hasattr(obj, "wrapped")
+        and hasattr(obj, "children")
+        and is_topods_shape(obj.wrapped)
+    )
 
 
 def is_build123d_shell(obj):
@@ -475,25 +490,13 @@ def get_downcasted_shape(shape):
     # if next(get_compounds(shape), None) is not None:
     #     objs = get_compounds(shape)
 
-    if next(get_solids(shape), None) is not None:
-        objs = get_solids(shape)
-
-    elif next(get_faces(shape), None) is not None:
-        objs = get_faces(shape)
+    # map every topology level only once, get_* already return downcasted shapes
+    for get_topo in (get_solids, get_faces, get_wires, get_edges, get_vertices):
+        objs = list(get_topo(shape))
+        if objs:
+            return objs
 
-    elif next(get_wires(shape), None) is not None:
-        objs = get_wires(shape)
-
-    elif next(get_edges(shape), None) is not None:
-        objs = get_edges(shape)
-
-    elif next(get_vertices(shape), None) is not None:
-        objs = get_vertices(shape)
-
-    else:
-        return []
-
-    return [downcast(obj) for obj in objs]
+    return []
 
 
 def get_point(vertex):
@@ -549,6 +552,16 @@ def list_topods_compound(compound):
         iterator.Next()
 
 
+def get_single_child(compound):
+    # Return the downcasted child if the compound has exactly one, else None
+    iterator = TopoDS_Iterator(compound)
+    if not iterator.More():
+        return None
+    child = iterator.Value()
+    iterator.Next()
+    return None if iterator.More() else downcast(child)
+
+
 def unroll_compound(compound, typ=None):
     result = []
     for o in compound:
@@ -694,7 +707,14 @@ def point(obj):
 #
 
 
-def tq_to_loc(t, q):
+# TopLoc_Location can only be reset to identity in place (Clear, Identity), hence
+# identity and memoized locations can safely be shared
+_IDENTITY_LOC = TopLoc_Location(gp_Trsf())
+_IDENTITY_TQ = ((0.0, 0.0, 0.0), (0.0, 0.0, 0.0, 1.0))
+
+
+@lru_cache(maxsize=1024)
+def _tq_to_loc(t, q):
     T = gp_Trsf()
     Q = gp_Quaternion(*q)
     V = gp_Vec(*t)
@@ -702,10 +722,17 @@ def tq_to_loc(t, q):
     return TopLoc_Location(T)
 
 
+def tq_to_loc(t, q):
+    return _tq_to_loc(tuple(t), tuple(q))
+
+
 def loc_to_tq(loc):
     if loc is None:
         return (None, None)
 
+    if loc is _IDENTITY_LOC or loc.IsIdentity():
+        return _IDENTITY_TQ
+
     T = loc.Transformation()
     t = T.TranslationPart()
     q = T.GetRotation()
@@ -713,7 +740,7 @@ def loc_to_tq(loc):
 
 
 def identity_location():
-    return TopLoc_Location(gp_Trsf())
+    return _IDENTITY_LOC
 
 
 def relocate(obj):
@@ -887,26 +914,38 @@ def is_plane_xy(obj):
 
 def make_key(objs, loc=None, optimal=False):  # pylint: disable=unused-argument
     # optimal is not used and as such ignored
-    if not isinstance(objs, (tuple, list)):
-        objs = [objs]
+    # HashCode is not memoized, since it changes when a shape is moved in place
+    if isinstance(objs, (tuple, list)):
+        shapes = tuple([(s.HashCode(MAX_HASH_KEY), id(s)) for s in objs])
+    else:
+        shapes = ((objs.HashCode(MAX_HASH_KEY), id(objs)),)
 
-    key = (tuple(((s.HashCode(MAX_HASH_KEY), id(s)) for s in objs)), loc_to_tq(loc))
+    key = (shapes, loc_to_tq(loc))
     return key
 
 
-def get_size(obj):
-    size = sys.getsizeof(obj)
-    if isinstance(obj, dict):
-        size += sum([get_size(v) + len(k) for k, v in obj.items()])
-    elif isinstance(obj, (tuple, list)):
-        size += sum([get_size(i) for i in obj])
-    return size
-
-
-cache = LRUCache(maxsize=16 * 1024 * 1024, getsizeof=get_size)
+# bounding boxes all have the same size, hence bound the number of entries
+# (about 0.7 kB each) instead of sizing every entry on insert
+cache = LRUCache(maxsize=16 * 1024)
 
 
 class BoundingBox(object):
+    # fixed slots keep the many instances created during assembly walks small
+    __slots__ = (
+        "optimal",
+        "xmin",
+        "xmax",
+        "ymin",
+        "ymax",
+        "zmin",
+        "zmax",
+        "xsize",
+        "ysize",
+        "zsize",
+        "center",
+        "max",
+    )
+
     def __init__(self, obj=None, optimal=False):
         self.optimal = optimal
         if obj is None:
@@ -940,12 +979,16 @@ class BoundingBox(object):
             BRepTools.Clean_s(obj)
             BRepBndLib.AddOptimal_s(obj, bbox)
         else:
-            BRepBndLib.Add_s(obj, bbox)
+            # useTriangulation=False: geometry only, independent of existing meshes
+            BRepBndLib.Add_s(obj, bbox, False)
         if not bbox.IsVoid():
             values = bbox.Get()
             return (values[0], values[3], values[1], values[4], values[2], values[5])
         else:
-            c = self._center_of_mass(obj)
+            # any vertex is good enough as a location, volume properties would
+            # integrate over all faces
+            v = next(get_vertices(obj), None)
+            c = self._center_of_mass(obj) if v is None else get_point(v)
             bb = (
                 c[0] - tol,
                 c[0] + tol,
@@ -967,17 +1010,12 @@ class BoundingBox(object):
             self.zmin + self.zsize / 2.0,
         )
         self.max = max(
-            [
-                abs(x)
-                for x in (
-                    self.xmin,
-                    self.xmax,
-                    self.ymin,
-                    self.ymax,
-                    self.zmin,
-                    self.zmax,
-                )
-            ]
+            abs(self.xmin),
+            abs(self.xmax),
+            abs(self.ymin),
+            abs(self.ymax),
+            abs(self.zmin),
+            abs(self.zmax),
         )
 
     def is_empty(self):
@@ -987,50 +1025,57 @@ class BoundingBox(object):
             and (abs(self.zmax - self.zmin) < 0.01)
         )
 
-    def max_dist_from_center(self):
-        return max(
-            [
-                distance(self.center, v)
-                for v in itertools.product(
-                    (self.xmin, self.xmax),
-                    (self.ymin, self.ymax),
-                    (self.zmin, self.zmax),
-                )
-            ]
+    def _max_dist_from(self, point):
+        # the farthest corner takes the bound farther away from point on each axis
+        bounds = np.array(
+            ((self.xmin, self.ymin, self.zmin), (self.xmax, self.ymax, self.zmax))
         )
+        return np.linalg.norm(np.abs(bounds - point).max(axis=0))
+
+    def max_dist_from_center(self):
+        return self._max_dist_from(self.center)
 
     def max_dist_from_origin(self):
-        return max(
-            [
-                np.linalg.norm(v)
-                for v in itertools.product(
-                    (self.xmin, self.xmax),
-                    (self.ymin, self.ymax),
-                    (self.zmin, self.zmax),
-                )
-            ]
-        )
+        return self._max_dist_from((0.0, 0.0, 0.0))
 
     def update(self, bb, minimize=False):
-        lower, upper = (max, min) if minimize else (min, max)
-
         if isinstance(bb, BoundingBox):
-            self.xmin = lower(bb.xmin, self.xmin)
-            self.xmax = upper(bb.xmax, self.xmax)
-            self.ymin = lower(bb.ymin, self.ymin)
-            self.ymax = upper(bb.ymax, self.ymax)
-            self.zmin = lower(bb.zmin, self.zmin)
-            self.zmax = upper(bb.zmax, self.zmax)
+            xmin, xmax, ymin, ymax = bb.xmin, bb.xmax, bb.ymin, bb.ymax
+            zmin, zmax = bb.zmin, bb.zmax
         elif isinstance(bb, dict):
-            self.xmin = lower(bb["xmin"], self.xmin)
-            self.xmax = upper(bb["xmax"], self.xmax)
-            self.ymin = lower(bb["ymin"], self.ymin)
-            self.ymax = upper(bb["ymax"], self.ymax)
-            self.zmin = lower(bb["zmin"], self.zmin)
-            self.zmax = upper(bb["zmax"], self.zmax)
+            xmin, xmax, ymin, ymax = bb["xmin"], bb["xmax"], bb["ymin"], bb["ymax"]
+            zmin, zmax = bb["zmin"], bb["zmax"]
         else:
             raise "Wrong bounding box param"
 
+        # comparisons instead of min/max calls, ties take the value of bb as before
+        if minimize:
+            if xmin >= self.xmin:
+                self.xmin = xmin
+            if xmax <= self.xmax:
+                self.xmax = xmax
+            if ymin >= self.ymin:
+                self.ymin = ymin
+            if ymax <= self.ymax:
+                self.ymax = ymax
+            if zmin >= self.zmin:
+                self.zmin = zmin
+            if zmax <= self.zmax:
+                self.zmax = zmax
+        else:
+            if xmin <= self.xmin:
+                self.xmin = xmin
+            if xmax >= self.xmax:
+                self.xmax = xmax
+            if ymin <= self.ymin:
+                self.ymin = ymin
+            if ymax >= self.ymax:
+                self.ymax = ymax
+            if zmin <= self.zmin:
+                self.zmin = zmin
+            if zmax >= self.zmax:
+                self.zmax = zmax
+
         self._calc()
 
     def to_dict(self):
@@ -1071,27 +1116,63 @@ def bounding_box(objs, loc=None, optimal=False):
 #
 
 
+def _quat_to_mat(x, y, z, w):
+    # rotation matrix of the (not necessarily normalized) quaternion (x, y, z, w)
+    s = 2.0 / (x * x + y * y + z * z + w * w)
+    xx, yy, zz = s * x * x, s * y * y, s * z * z
+    xy, xz, yz = s * x * y, s * x * z, s * y * z
+    wx, wy, wz = s * w * x, s * w * y, s * w * z
+    return np.array(
+        (
+            (1.0 - yy - zz, xy - wz, xz + wy),
+            (xy + wz, 1.0 - xx - zz, yz - wx),
+            (xz - wy, yz + wx, 1.0 - xx - yy),
+        )
+    )
+
+
 def np_bbox(p, t, q):
     if p.size == 0:
         return None
 
-    n_p = p.reshape(-1, 3)
     if t is None and q is None:
-        v = n_p
-    else:
-        n_t = np.asarray(t)
-        n_q = np.quaternion(q[-1], *q[:-1])
-        v = rotate_vectors([n_q], n_p)[0] + n_t
+        n_p = p.reshape(-1, 3)
+        bbmin = np.min(n_p, axis=0)
+        bbmax = np.max(n_p, axis=0)
+        return {
+            "xmin": bbmin[0],
+            "xmax": bbmax[0],
+            "ymin": bbmin[1],
+            "ymax": bbmax[1],
+            "zmin": bbmin[2],
+            "zmax": bbmax[2],
+        }
+
+    # rotate, translate and reduce in one pass without a rotated copy of p
+    m = np.empty((3, 4))
+    m[:, :3] = _quat_to_mat(*q)
+    m[:, 3] = t
+    return np_bbox_from_matrix(p, m)
+
 
-    bbmin = np.min(v, axis=0)
-    bbmax = np.max(v, axis=0)
+def loc_to_matrix(loc):
+    T = loc.Transformation()
+    return np.array([[T.Value(i, j) for j in range(1, 5)] for i in range(1, 4)])
+
+
+def np_bbox_from_matrix(p, m):
+    """Bounding box of the points p transformed by the 3x4 matrix m"""
+    if p.size == 0:
+        return None
+
+    bbmin_max = bbox_from_vertices(p.reshape(-1, 3), m)
     return {
-        "xmin": bbmin[0],
-        "xmax": bbmax[0],
-        "ymin": bbmin[1],
-        "ymax": bbmax[1],
-        "zmin": bbmin[2],
-        "zmax": bbmax[2],
+        "xmin": bbmin_max[0],
+        "xmax": bbmin_max[3],
+        "ymin": bbmin_max[1],
+        "ymax": bbmin_max[4],
+        "zmin": bbmin_max[2],
+        "zmax": bbmin_max[5],
     }
 
 
@@ -1127,6 +1208,37 @@ def serialize(shape, triangles=False, normals=False):
     return buffer
 
 
+class HashWriter:
+    """Write-only stream that feeds everything written to it into a hasher"""
+
+    def __init__(self, hasher):
+        self.hasher = hasher
+        self.pos = 0
+
+    def write(self, buffer):
+        self.hasher.update(buffer)
+        self.pos += len(buffer)
+        return len(buffer)
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        # OCCT only asks for the current position, real seeks are impossible
+        if (whence == io.SEEK_CUR and offset == 0) or (
+            whence == io.SEEK_SET and offset == self.pos
+        ):
+            return self.pos
+        raise io.UnsupportedOperation("HashWriter cannot seek")
+
+    def flush(self):
+        pass
+
+
+def serialize_to(shape, stream, triangles=False, normals=False):
+    BinTools.Write_s(shape, stream, triangles, normals, BinTools_FormatVersion_CURRENT)
+
+
 def deserialize(buffer):
     if buffer is None:
         return None
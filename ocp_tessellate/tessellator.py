@@ -18,6 +18,7 @@
 
 import os
 import sys
+import threading
 
 import numpy as np
 from cachetools import LRUCache, cached
@@ -104,20 +105,39 @@ def make_key(
         compute_faces,
     )
 
-    if progress is not None and cache.get(key) is not None:
-        progress.update("c")
+    if progress is not None:
+        with cache_lock:
+            if cache.get(key) is not None:
+                progress.update("c")
 
     return key
 
 
 def get_size(obj):
-    size = sys.getsizeof(obj)
-    if isinstance(obj, dict):
-        size += sum([get_size(v) + len(k) for k, v in obj.items()])
-    elif isinstance(obj, np.ndarray):
-        size += obj.size * obj.dtype.itemsize
-    elif isinstance(obj, (tuple, list)):
-        size += sum([get_size(i) for i in obj])
+    # walk nested containers with a stack, containers and arrays referenced more
+    # than once are only counted once
+    size = 0
+    seen = set()
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if isinstance(o, (bytes, bytearray)):
+            size += len(o) + 33  # header size of a bytes object
+            continue
+
+        if isinstance(o, (dict, np.ndarray, tuple, list)):
+            if id(o) in seen:
+                continue
+            seen.add(id(o))
+
+        size += sys.getsizeof(o)
+        if isinstance(o, dict):
+            size += sum(len(k) for k in o)
+            stack.extend(o.values())
+        elif isinstance(o, np.ndarray):
+            size += o.size * o.dtype.itemsize
+        elif isinstance(o, (tuple, list)):
+            stack.extend(o)
     return size
 
 
@@ -127,6 +147,8 @@ if cache_size is None:
 else:
     cache_size = int(cache_size) * 1024 * 1024
 cache = LRUCache(maxsize=cache_size, getsizeof=get_size)
+# tessellate can be called from several threads (see tessellate_group)
+cache_lock = threading.RLock()
 
 
 def face_mapper(shape, id):
@@ -437,7 +459,7 @@ def compute_quality(bb, deviation=0.1):
 
 
 # cache key: (shape.hash, cache_key, deviaton, angular_tolerance, compute_edges, compute_faces)
-@cached(cache, key=make_key)
+@cached(cache, key=make_key, lock=cache_lock)
 def tessellate(
     shape,
     cache_key,
@@ -5,6 +5,7 @@ import time
 import warnings
 
 import numpy as np
+from cachetools import LRUCache
 from webcolors import hex_to_rgb, name_to_rgb, rgb_to_hex
 
 
@@ -55,11 +56,11 @@ class Color:
             self.b = c.blue
         elif isinstance(color, (tuple, list)) and len(color) >= 3:
             rgb = color[:3]
-            if any([isinstance(c, float) for c in rgb]) and all(
-                [0.0 <= c <= 1.0 for c in rgb]
+            if any(isinstance(c, float) for c in rgb) and all(
+                0.0 <= c <= 1.0 for c in rgb
             ):
                 self.r, self.g, self.b = (int(c * 255) for c in rgb)
-            elif all([isinstance(c, int) and (0 <= c <= 255) for c in rgb]):
+            elif all(isinstance(c, int) and (0 <= c <= 255) for c in rgb):
                 self.r, self.g, self.b = rgb
             else:
                 self._invalid(color)
@@ -155,6 +156,26 @@ class Timer:
 #
 
 
+_parsed_colors = LRUCache(maxsize=1024)
+
+
+def cached_color(color):
+    # Color is mutable, hence return a copy of the parsed color.
+    # Only color names, hex strings and tuples are cached
+    if isinstance(color, str):
+        key = color
+    elif isinstance(color, tuple):
+        # (1, 1, 0) == (1.0, 1.0, 0.0), but ints are 0..255 and floats 0..1
+        key = (color, tuple(type(c) for c in color))
+    else:
+        return Color(color)
+
+    parsed = _parsed_colors.get(key)
+    if parsed is None:
+        parsed = _parsed_colors[key] = Color(color)
+    return Color(parsed)
+
+
 def get_color(in_color, def_color, alpha):
     color = Color(def_color if in_color is None else in_color)
     if isinstance(alpha, float) and 0 <= alpha < 1.0:
@@ -0,0 +1,65 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from ocp_tessellate._numba_kernels import _bbox_loop, _bbox_numpy
+from ocp_tessellate.ocp_utils import BoundingBox
+
+
+class TestBboxKernels(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(42)
+
+    def _matrix(self):
+        m = np.empty((3, 4))
+        m[:, :3] = self.rng.normal(size=(3, 3))
+        m[:, 3] = self.rng.uniform(-10, 10, size=3)
+        return m
+
+    def test_loop_equals_numpy(self):
+        for n in (1, 2, 17, 1000):
+            p = self.rng.uniform(-100, 100, size=(n, 3))
+            m = self._matrix()
+            np.testing.assert_allclose(_bbox_loop(p, m), _bbox_numpy(p, m))
+
+    def test_identity(self):
+        p = self.rng.uniform(-1, 1, size=(50, 3))
+        m = np.hstack((np.eye(3), np.zeros((3, 1))))
+        bb = _bbox_loop(p, m)
+        np.testing.assert_array_equal(bb[:3], p.min(axis=0))
+        np.testing.assert_array_equal(bb[3:], p.max(axis=0))
+
+
+class TestBoundingBoxDistances(unittest.TestCase):
+    def _corner_max(self, bb, point):
+        corners = itertools.product(
+            (bb.xmin, bb.xmax), (bb.ymin, bb.ymax), (bb.zmin, bb.zmax)
+        )
+        return max(np.linalg.norm(np.subtract(c, point)) for c in corners)
+
+    def test_max_dist_equals_corner_max(self):
+        rng = np.random.default_rng(7)
+        for _ in range(20):
+            lo = rng.uniform(-10, 10, size=3)
+            hi = lo + rng.uniform(0, 10, size=3)
+            bb = BoundingBox(
+                {
+                    "xmin": lo[0],
+                    "xmax": hi[0],
+                    "ymin": lo[1],
+                    "ymax": hi[1],
+                    "zmin": lo[2],
+                    "zmax": hi[2],
+                }
+            )
+            self.assertAlmostEqual(
+                bb.max_dist_from_center(), self._corner_max(bb, bb.center), 10
+            )
+            self.assertAlmostEqual(
+                bb.max_dist_from_origin(), self._corner_max(bb, (0, 0, 0)), 10
+            )
+            point = rng.uniform(-20, 20, size=3)
+            self.assertAlmostEqual(
+                bb._max_dist_from(point), self._corner_max(bb, point), 10
+            )
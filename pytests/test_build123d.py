@@ -907,6 +907,17 @@ class TestsConvertMoved(MyUnitTest):
         self.assertIsNone(o.obj)
         self.assertTrue(is_topods_solid(i[o.ref]["obj"]))
 
+    def test_wire_moved_in_place(self):
+        """Test that a wire moved in place after a conversion is converted correctly"""
+        w = Wire.make_circle(1)
+        c = OcpConverter()
+        c.to_ocp(w)
+        w.move(Location((10, 0, 0)))
+        g = c.to_ocp(w)
+        bb = bounding_box(g.objects[0].obj)
+        self.assertAlmostEqual(bb.xmin, 9, 6)
+        self.assertAlmostEqual(bb.xmax, 11, 6)
+
 
 class TestConvertMixedCompounds(MyUnitTest):
 
@@ -1128,3 +1139,17 @@ class TestMultipleObjects(MyUnitTest):
         self.assertEqual(o.name, "b2")
         self.assertEqual(o.color.web_color, "#0000ff")
         self.assertEqual(o.color.a, 0.4)
+
+
+class TestDispatch(MyUnitTest):
+    def test_solid_after_solid_with_children(self):
+        s = Solid.make_box(1, 1, 1)
+        Solid.make_box(2, 2, 2).parent = s
+        OcpConverter().to_ocp(s)
+
+        c = OcpConverter()
+        g = c.to_ocp(Solid.make_box(3, 3, 3))
+        self.assertEqual(g.length, 1)
+        o = g.objects[0]
+        self.assertEqual(o.kind, "solid")
+        self.assertTrue(is_topods_solid(c.instances[o.ref]["obj"]))
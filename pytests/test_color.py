@@ -5,7 +5,7 @@ import cadquery as cq
 import pytest
 
 from ocp_tessellate.ocp_utils import get_rgba
-from ocp_tessellate.utils import Color
+from ocp_tessellate.utils import Color, cached_color
 
 
 class TestColor(unittest.TestCase):
@@ -71,6 +71,32 @@ class TestColor(unittest.TestCase):
             c = Color(Color("redxgreenxblue", 1.2))
 
 
+class TestCachedColor(unittest.TestCase):
+
+    def test_color_name(self):
+        c = cached_color("aliceblue")
+        self.assertEqual(c.web_color, "#f0f8ff")
+        self.assertEqual(c.a, 1.0)
+
+    def test_copy(self):
+        c1 = cached_color("aliceblue")
+        c1.a = 0.2
+        c2 = cached_color("aliceblue")
+        self.assertIsNot(c1, c2)
+        self.assertEqual(c2.a, 1.0)
+
+    def test_rgb_alpha(self):
+        c = cached_color((160, 64, 16, 128))
+        self.assertEqual(c.web_color, "#a04010")
+        self.assertAlmostEqual(c.a, 128 / 255, 6)
+
+    def test_int_float(self):
+        c1 = cached_color((1, 1, 0))
+        c2 = cached_color((1.0, 1.0, 0.0))
+        self.assertEqual(c1.web_color, "#010100")
+        self.assertEqual(c2.web_color, "#ffff00")
+
+
 class TestGetRgba(unittest.TestCase):
 
     def test_color_name(self):
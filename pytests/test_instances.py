@@ -2,10 +2,12 @@ import copy
 import unittest
 
 import build123d as bd
+import numpy as np
 from build123d import *
 
-from ocp_tessellate.convert import OcpConverter, tessellate_group
+from ocp_tessellate.convert import OcpConverter, shares_edges, tessellate_group
 from ocp_tessellate.ocp_utils import *
+from ocp_tessellate.tessellator import cache
 
 
 def reference(obj, label, loc=None):
@@ -97,3 +99,85 @@ class TestInstances(MyUnitTest):
         i = c.instances
         self.assertEqual(len(i), 4)
         _ = tessellate_group(g, i, progress=ProgressCache(3, self))
+
+
+class ProgressMarks:
+    def __init__(self):
+        self.marks = []
+
+    def update(self, mark):
+        self.marks.append(mark)
+
+
+class TestParallel(MyUnitTest):
+    def _tessellate(self, parallel):
+        cache.clear()
+        objs = [
+            Sphere(1),
+            Pos(X=3) * Box(1, 2, 3),
+            Pos(X=-3) * Cylinder(1, 2),
+            Pos(Y=3) * Torus(2, 0.5),
+        ]
+        c = OcpConverter()
+        g = c.to_ocp(*objs)
+        progress = ProgressMarks()
+        meshed_instances, shapes, _, _ = tessellate_group(
+            g, c.instances, {"parallel": parallel}, progress=progress
+        )
+        self.assertEqual(len(progress.marks), len(c.instances))
+        return meshed_instances, shapes["bb"]
+
+    def test_parallel_equals_serial(self):
+        serial, serial_bb = self._tessellate(False)
+        parallel, parallel_bb = self._tessellate(True)
+
+        self.assertEqual(len(serial), len(parallel))
+        for s, p in zip(serial, parallel):
+            self.assertEqual(s.keys(), p.keys())
+            for key in s:
+                np.testing.assert_array_equal(s[key], p[key])
+        self.assertEqual(serial_bb, parallel_bb)
+
+    def test_shares_edges(self):
+        solid = Solid.make_box(1, 1, 1)
+        faces = solid.faces()
+        self.assertTrue(shares_edges([solid.wrapped, faces[0].wrapped]))
+        # adjacent faces share an edge, but no face
+        self.assertTrue(shares_edges([faces[0].wrapped, faces[2].wrapped]))
+        self.assertFalse(shares_edges([faces[0].wrapped, faces[1].wrapped]))
+        self.assertFalse(
+            shares_edges([solid.wrapped, Solid.make_box(1, 1, 1).wrapped])
+        )
+
+
+class TestCacheIds(MyUnitTest):
+    def test_cache_ids_level(self):
+        b = Box(1, 1, 1)
+        c = OcpConverter()
+        g = c.to_ocp(b, Pos(5, 0, 0) * Sphere(1), level=1)
+        i = c.instances
+        self.assertEqual(len(i), 2)
+        for instance in i:
+            self.assertIsNotNone(instance["cache_id"])
+        self.assertNotEqual(i[0]["cache_id"], i[1]["cache_id"])
+
+        meshed_instances, _, _, _ = tessellate_group(g, i)
+        self.assertNotEqual(
+            len(meshed_instances[0]["vertices"]), len(meshed_instances[1]["vertices"])
+        )
+
+    def test_repeated_parts_share_cache_id(self):
+        b = Box(1, 2, 3)
+        c = OcpConverter()
+        g = c.to_ocp(b, reference(b, "b1", Pos(X=3)), reference(b, "b2", Pos(X=-3)))
+        self.assertEqual(len(c.instances), 1)
+        cache_ids = {o.cache_id for o in g.objects}
+        self.assertEqual(cache_ids, {c.instances[0]["cache_id"]})
+        self.assertIsNotNone(c.instances[0]["cache_id"])
+
+    def test_missing_cache_id(self):
+        c = OcpConverter()
+        g = c.to_ocp(Box(1, 1, 1))
+        c.instances[0]["cache_id"] = None
+        with self.assertRaises(ValueError):
+            tessellate_group(g, c.instances)
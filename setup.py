@@ -26,12 +26,12 @@ setup_args = {
     "install_requires": [
         "webcolors~=1.12",
         "numpy",
-        "numpy-quaternion",
         "cachetools~=5.2.0",
         "imagesize",
     ],
     "extras_require": {
         "dev": {"twine", "bumpversion", "black", "pylint", "pyYaml"},
+        "fast": {"xxhash", "numba"},
     },
     "packages": find_packages(),
     "zip_safe": False,